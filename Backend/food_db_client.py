@@ -1,9 +1,12 @@
-import dotenv 
+import dotenv
 from urllib.parse import urljoin
 from pathlib import Path
 import logging
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import numpy as np
 import json
 import os
@@ -13,15 +16,49 @@ class FoodDBClient:
     dotenv.load_dotenv("credentials.env")
     _usda_api_key = os.getenv("USDA_FOOD_KEY")
     base_url = "https://api.nal.usda.gov/fdc/v1/"
+
+    # one session for all USDA calls: reuses the TCP/TLS connection between
+    # lookups instead of a fresh handshake per request, and retries transient errors
+    _session = requests.Session()
+    _session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    ))
     foundation_foods_folder = Path("data/FoodData_Central_foundation_foods_csv_2025-04-24")
     fndds_foods_file = Path("data/2021-2023_FNDDS_Nutrient_Values.xlsx")
+    fndds_parquet_file = Path("data/2021-2023_FNDDS_Nutrient_Values.parquet")
+    cleaned_fndds_file = Path(__file__).resolve().parent / "data" / "cleaned_fndds_nutrients.parquet"
+    nutrient_cols_file = Path(__file__).resolve().parent / "data" / "nutrient_cols.json"
 
     # console prints when enabled
     debug_enabled = False
 
+    # downstream code only ever touches these food_nutrient columns, so skip
+    # parsing the rest (derivation ids, footnotes, etc.)
+    FOOD_NUTRIENT_COLUMNS = ["fdc_id", "nutrient_id", "amount"]
+
+    # single-pass character mapping for FNDDS column-name cleaning
+    _COLUMN_NAME_TRANS = str.maketrans({'(': '', ')': '', ',': '', '-': '_', '/': '_'})
+
     # DataFrames that will be queried frequently
-    #   For now, these are pretty small, so it's ok to store them like this. 
+    #   For now, these are pretty small, so it's ok to store them like this.
     #   In the future, it would probably be pertinent to consider an external database.
+    _all_nutrients_cache: pd.DataFrame = None
+    _fndds_foods_cache: pd.DataFrame = None
+    _foods_for_solve_cache: pd.DataFrame = None
+    _food_nutrient_cache: dict = {}     # fdc_id -> DataFrame of that food's nutrients
+
+    @classmethod
+    def invalidate_caches(cls):
+        """
+        Drops all cached DataFrames so the next accessor call re-reads from disk.
+        Call this after the underlying data files change.
+        """
+        cls._all_nutrients_cache = None
+        cls._fndds_foods_cache = None
+        cls._foods_for_solve_cache = None
+        cls._food_nutrient_cache = {}
 
     @classmethod
     def get_food_by_id(cls, fdcId):
@@ -41,7 +78,7 @@ class FoodDBClient:
                 raise ValueError(f"fdcId must be numeric, got '{fdcId}'")
         
         url = urljoin(cls.base_url, f"food/{fdcId}")
-        response = requests.get(url, params={"api_key" : cls._usda_api_key})
+        response = cls._session.get(url, params={"api_key" : cls._usda_api_key})
         
         if cls.debug_enabled:
             print(json.dumps(response.json(), indent=4))
@@ -62,50 +99,111 @@ class FoodDBClient:
             pd.DataFrame: A DataFrame of nutrient data
         """
 
+        if cls._all_nutrients_cache is not None:
+            return cls._all_nutrients_cache
+
         filePath = Path.joinpath(cls.foundation_foods_folder, "nutrient.csv")
 
         if cls.debug_enabled:
             print(f"Loaded all nutrients from {filePath}")
 
-        return pd.read_csv(filePath)
+        cls._all_nutrients_cache = pd.read_csv(filePath)
+        return cls._all_nutrients_cache
     
+    @classmethod
+    def _ensure_food_nutrient_parquet(cls) -> Path:
+        """
+        One-time conversion of food_nutrient.csv to a Parquet file sorted by fdc_id.
+        Sorting keeps each fdc_id confined to few row groups, so the per-group
+        min/max statistics let readers skip everything else (predicate pushdown).
+        """
+        parquet_path = Path.joinpath(cls.foundation_foods_folder, "food_nutrient.parquet")
+        if parquet_path.exists():
+            return parquet_path
+
+        # pyarrow's csv reader is multithreaded and parses straight into Arrow
+        # buffers, so the conversion never round-trips through pandas
+        csv_path = Path.joinpath(cls.foundation_foods_folder, "food_nutrient.csv")
+        nutrients_table = pacsv.read_csv(
+            csv_path,
+            convert_options=pacsv.ConvertOptions(include_columns=cls.FOOD_NUTRIENT_COLUMNS),
+        ).sort_by("fdc_id")
+        pq.write_table(
+            nutrients_table,
+            parquet_path,
+            row_group_size=50_000,
+            compression="zstd",
+        )
+
+        if cls.debug_enabled:
+            print(f"Converted {csv_path} to {parquet_path}")
+
+        return parquet_path
+
     @classmethod
     def get_food_nutrients(cls, fdcId):
         """
         Returns a dataframe of the foodNutrient schema associated with a particular food.
         """
-        filePath = Path.joinpath(cls.foundation_foods_folder, "food_nutrient.csv")
-        
-        # eventually, need to find a way to query this more efficiently, instead of loading the whole thing in.
-        nutrients_df = pd.read_csv(filePath)
+        fdcId = int(fdcId)
+        if fdcId in cls._food_nutrient_cache:
+            return cls._food_nutrient_cache[fdcId]
+
+        parquet_path = cls._ensure_food_nutrient_parquet()
+
+        # predicate pushdown: only row groups whose fdc_id range covers this id are read
+        nutrients_df = pq.read_table(
+            parquet_path,
+            columns=cls.FOOD_NUTRIENT_COLUMNS,
+            filters=[("fdc_id", "=", fdcId)],
+        ).to_pandas()
 
         if cls.debug_enabled:
             print(f"Loaded nutrients for fdcId {fdcId}")
 
-        return nutrients_df[nutrients_df['fdc_id'] == fdcId]
+        cls._food_nutrient_cache[fdcId] = nutrients_df
+        return nutrients_df
 
     @classmethod 
     def get_fndds_foods(cls) -> pd.DataFrame:
         """
-        Cleans and returns a dataframe of the FNDDS foods csv. 
+        Cleans and returns a dataframe of the FNDDS foods csv.
         """
+        if cls._fndds_foods_cache is not None:
+            return cls._fndds_foods_cache
+
         print("get_fndds_foods: STARTING...")
-        fndds_df = pd.read_excel(FoodDBClient.fndds_foods_file)
-
-        # Clean column names: remove newlines, extra spaces, and replace special characters
-        fndds_df.columns = (
-            fndds_df.columns
-            .str.replace('\n', ' ', regex=True)
-            .str.replace(r'\s+', '_', regex=True)
-            .str.strip()
-            .str.replace('(', '', regex=False)
-            .str.replace(')', '', regex=False)
-            .str.replace('-', '_', regex=False)
-            .str.replace(',', '', regex=False)
-            .str.replace('/', '_', regex=False)
-            .str.lower()
+
+        # the xlsx parse is by far the slowest step in the pipeline, so the cleaned
+        # frame is persisted to Parquet on first run and loaded from there after
+        if cls.fndds_parquet_file.exists():
+            fndds_df = pd.read_parquet(cls.fndds_parquet_file)
+            print("get_fndds_foods: ...DONE (from parquet)")
+            cls._fndds_foods_cache = fndds_df
+            return fndds_df
+
+        # project away per-fatty-acid columns up front, except the omega-3 sources
+        # that get aggregated below; everything else with a ':' is dropped anyway
+        omega3_prefixes = ('18:3', '20:5 n-3', '22:5 n-3', '22:6 n-3')
+
+        def keep_column(name: str) -> bool:
+            normalized = ' '.join(str(name).split())
+            return ':' not in normalized or normalized.startswith(omega3_prefixes)
+
+        fndds_df = pd.read_excel(
+            FoodDBClient.fndds_foods_file,
+            usecols=keep_column,
+            engine="openpyxl",
+            engine_kwargs={"read_only": True, "data_only": True},
         )
 
+        # Clean column names: remove newlines, extra spaces, and replace special
+        # characters -- one pass per name instead of nine .str Index rebuilds
+        fndds_df.columns = [
+            '_'.join(str(col).translate(cls._COLUMN_NAME_TRANS).lower().split())
+            for col in fndds_df.columns
+        ]
+
         # Aggregate omega-3 fatty acids: 18:3, 20:5 n-3, 22:5 n-3, 22:6 n-3
         omega3_cols = ['18:3 g', '20:5 n-3 g', '22:5 n-3 g', '22:6 n-3 g']
 
@@ -117,9 +215,57 @@ class FoodDBClient:
         fatty_acid_cols = [col for col in fndds_df.columns if ':' in col]
         fndds_df = fndds_df.drop(columns=fatty_acid_cols)
         
+        fndds_df.to_parquet(cls.fndds_parquet_file, compression="zstd")
+
         print("get_fndds_foods: ...DONE")
+        cls._fndds_foods_cache = fndds_df
         return fndds_df
 
+    @classmethod
+    def load_foods_df(cls) -> pd.DataFrame:
+        """
+        Loads the cleaned FNDDS DataFrame used by the solver, creating and persisting
+        it on the first ever run. The frame is cached for the session, so long-running
+        callers (e.g. a future API server) only pay the Parquet decode once.
+
+        Returns:
+            pd.DataFrame: The cleaned foods DataFrame, ready for Solver.solve().
+        """
+        if cls._foods_for_solve_cache is not None:
+            return cls._foods_for_solve_cache
+
+        if cls.cleaned_fndds_file.exists():
+            # arrow-backed dtypes keep the columns as views over the decoded
+            # Parquet buffers instead of copying everything into numpy up front
+            foods_df = pd.read_parquet(cls.cleaned_fndds_file, dtype_backend="pyarrow")
+            print(f"Loaded data from {cls.cleaned_fndds_file}")
+        else:
+            print(f"Creating {cls.cleaned_fndds_file} for the first time...")
+            foods_df = cls.clean_fndds_foods_for_solve(cls.get_fndds_foods())
+            cls.cleaned_fndds_file.parent.mkdir(parents=True, exist_ok=True)
+            foods_df.to_parquet(cls.cleaned_fndds_file)
+            print(f"Data saved to {cls.cleaned_fndds_file}")
+
+        cls._foods_for_solve_cache = foods_df
+        return foods_df
+
+    @classmethod
+    def load_nutrient_cols(cls) -> list[str]:
+        """
+        Returns the nutrient column names of the cleaned foods DataFrame. The list
+        is persisted as a json sidecar next to the cleaned parquet, so runs after
+        the first skip the per-run schema walk in get_nutrient_cols().
+        """
+        if cls.nutrient_cols_file.exists():
+            with open(cls.nutrient_cols_file, "r") as f:
+                return json.load(f)
+
+        nutrient_cols = cls.get_nutrient_cols(cls.load_foods_df())
+        cls.nutrient_cols_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cls.nutrient_cols_file, "w") as f:
+            json.dump(nutrient_cols, f)
+        return nutrient_cols
+
     @classmethod
     def clean_fndds_foods_for_solve(cls, fndds_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -137,27 +283,27 @@ class FoodDBClient:
         cleaned_df = cleaned_df[cleaned_df["energy_kcal"] > 0]
         # remove baby foods
         cleaned_df = cls.remove_baby_food_data(cleaned_df)
-        # convert to per_g rather than per_100_g units
+        # convert to per_g rather than per_100_g units; float32 is plenty of
+        # precision for nutrient amounts and halves the frame's memory traffic
         nutrient_cols = cls.get_nutrient_cols(cleaned_df)
-        cleaned_df[nutrient_cols] = cleaned_df[nutrient_cols] / 100
+        cleaned_df[nutrient_cols] = (cleaned_df[nutrient_cols] / 100).astype(np.float32)
 
         print("clean_fndds_foods_for_solve: ...DONE")
         return cleaned_df
     
     @classmethod
     def remove_baby_food_data(cls, df: pd.DataFrame) -> pd.DataFrame:
-        unique_wweia_categories = sorted(df["wweia_category_description"].unique())
-        keywords = ["baby", "infant", "toddler"]
-        baby_food_categories = [cat for cat in unique_wweia_categories if any(k in cat.lower() for k in keywords)]
-        new_df = df[~df["wweia_category_description"].isin(baby_food_categories)]
-        return new_df
+        mask = df["wweia_category_description"].str.contains(
+            r"baby|infant|toddler", case=False, regex=True, na=False
+        )
+        return df[~mask]
 
     @classmethod
     def get_nutrient_cols(cls, df: pd.DataFrame) -> list[str]:
         """
         Get the column names for all nutrients recorded in the table.
         """
-        numeric_cols = df.select_dtypes(include=['float64','int64']).columns
+        numeric_cols = df.select_dtypes(include=['float64','float32','int64']).columns
         exclude_cols = ['food_code', 'wweia_category_number']
         nutrient_cols = [col for col in numeric_cols if col not in exclude_cols]
         return nutrient_cols
\ No newline at end of file
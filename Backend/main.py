@@ -1,28 +1,15 @@
-import pandas as pd
-import os, pathlib
+import os
 from solver import Solver, SolverSettings
 from food_db_client import FoodDBClient
 from nutrition_constraints import NutrientConstraints
 
 print("CALORIE OPTIMIZER V1")
 
+# read from the cached parquet file, creating the cleaned DF on the first ever run
+foods_df = FoodDBClient.load_foods_df()
 
-BASE_DIR = pathlib.Path(__file__).resolve().parent  # folder containing main.py
-food_file = BASE_DIR / "data" / "cleaned_fndds_nutrients.parquet"
 
-# try to read from parquet file, otherwise create the cleaned DF for the first time
-if os.path.exists(food_file):
-    foods_df = pd.read_parquet(food_file)
-    print(f"Loaded data from {food_file}")
-else:
-    print(f"Creating {food_file} for the first time...")
-    foods_df = FoodDBClient.clean_fndds_foods_for_solve(FoodDBClient.get_fndds_foods())
-    os.makedirs(os.path.dirname(food_file), exist_ok=True)
-    foods_df.to_parquet(food_file)
-    print(f"Data saved to {food_file}")
-
-
-nutrient_columns: list[str] = FoodDBClient.get_nutrient_cols(foods_df)
+nutrient_columns: list[str] = FoodDBClient.load_nutrient_cols()
 
 print("valid nutrient types: ")
 print(nutrient_columns)
@@ -2,6 +2,7 @@
 from dataclasses import dataclass, asdict
 from typing import Dict, Optional, Iterable, List, Tuple
 import math
+import pandas as pd
 
 @dataclass
 class NutrientConstraint:
@@ -80,13 +81,58 @@ class NutrientConstraints:
             NutrientConstraints object
         """
         inst = NutrientConstraints()
-        with open(file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                nc = NutrientConstraint.from_string(line)
-                inst.nutrients[nc.name] = nc
+        try:
+            # read everything as strings first so field counts and bad values
+            # can be rejected explicitly instead of silently coerced
+            rows = pd.read_csv(
+                file,
+                header=None,
+                comment="#",
+                index_col=False,
+                skipinitialspace=True,
+                skip_blank_lines=True,
+                dtype=str,
+                keep_default_na=False,
+                na_values=[],
+            )
+        except pd.errors.EmptyDataError:
+            return inst
+        except pd.errors.ParserError:
+            raise ValueError("incorrect input, expected 3 elements in the form of [Name],[min_g],[max_g]")
+
+        # rows with too few fields surface as missing values in the later columns
+        if rows.shape[1] != 3 or rows.isna().any().any():
+            raise ValueError("incorrect input, expected 3 elements in the form of [Name],[min_g],[max_g]")
+        rows.columns = ["name", "min_g", "max_g"]
+
+        rows["name"] = rows["name"].str.strip()
+        if (rows["name"] == "").any():
+            raise ValueError("name must be non-empty")
+
+        # '-' means "no bound"; anything else must parse as a number
+        # (to_numeric quietly maps "" to NaN, so reject empty fields up front)
+        if (rows["min_g"].str.strip() == "").any() or (rows["max_g"].str.strip() == "").any():
+            raise ValueError("could not parse numeric bounds: empty value")
+        try:
+            rows["min_g"] = pd.to_numeric(rows["min_g"].mask(rows["min_g"].str.strip() == "-")).fillna(0.0)
+            rows["max_g"] = pd.to_numeric(rows["max_g"].mask(rows["max_g"].str.strip() == "-")).fillna(math.inf)
+        except ValueError as e:
+            raise ValueError(f"could not parse numeric bounds: {e}")
+
+        # vectorized equivalents of NutrientConstraint.validate
+        if valid_nutrients is not None:
+            invalid = rows.loc[~rows["name"].isin(set(valid_nutrients)), "name"]
+            if not invalid.empty:
+                raise ValueError(f"invalid nutrient names: {invalid.tolist()}")
+        if (rows["min_g"] < 0).any() or (rows["max_g"] < 0).any():
+            raise ValueError("min_g and max_g must be non-negative")
+        if (rows["max_g"] < rows["min_g"]).any():
+            raise ValueError("max_g must be >= min_g")
+
+        for row in rows.itertuples(index=False):
+            inst.nutrients[row.name] = NutrientConstraint(
+                name=row.name, min_g=float(row.min_g), max_g=float(row.max_g)
+            )
         return inst
 
 
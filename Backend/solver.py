@@ -1,7 +1,8 @@
 import math
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from ortools.linear_solver import pywraplp
+from ortools.linear_solver.python import model_builder
 from nutrition_constraints import NutrientConstraints
 from typing import Iterable
 
@@ -40,104 +41,116 @@ class Solver:
             raise ValueError("No nutrients to were given to optimize for")
 
         # Check that nutrition constraints are for valid nutrient types that exist in df
-        data = df.copy()
-        for col in (list(nutrition_constraints.nutrients.keys()) + nutrients_to_optimize):
-            if col not in df.columns:
-                raise ValueError(f"{col} is not present in the dataframe")
+        needed = list(nutrition_constraints.nutrients.keys()) + list(nutrients_to_optimize)
+        missing = set(needed).difference(df.columns)
+        if missing:
+            raise ValueError(f"{sorted(missing)} not present in the dataframe")
 
-        n = len(data)
+        n = len(df)
         if n == 0:
             raise ValueError("No foods (rows) in dataframe")
 
-        # create solver
-        solver = pywraplp.Solver.CreateSolver('GLOP')   # continuous LP solver
-        if solver is None:
-            raise RuntimeError("GLOP solver unavailable")
-        inf = solver.infinity()
+        # build the model with model_builder, which takes whole numpy coefficient
+        # vectors per constraint instead of one pybind SetCoefficient call per cell
+        model = model_builder.Model()
 
         # Create decision variables and keep stable map to foods (use food_code if present)
-        var_list = []
-        var_ids = []
-        for i in range(n):
-            ub = max_qty_per_food if max_qty_per_food is not None else inf
-            fid = str(data.iloc[i]['food_code'])
-            var = solver.NumVar(0.0, ub, f"x_{fid}")
-            var_list.append(var)
-            var_ids.append(fid)
-
-        # Build coefficient arrays for all relevant nutrients (constraints + objective)
-        coeff_arrays = {}
-        all_nutrients = set(list(nutrition_constraints.nutrients.keys()) + nutrients_to_optimize)
-        for nutrient in all_nutrients:
-            coeff_arrays[nutrient] = data[nutrient].to_numpy() # np array length n
-            
+        # pull the codes out as one numpy array up front; per-row .iloc goes through
+        # pandas index machinery on every access
+        ub = max_qty_per_food if max_qty_per_food is not None else math.inf
+        codes = df['food_code'].to_numpy()
+        var_ids = [str(code) for code in codes]
+        var_list = [model.new_num_var(0.0, ub, f"x_{fid}") for fid in var_ids]
+        var_arr = np.asarray(var_list, dtype=object)    # allows fancy indexing by nonzero positions
+
+        # Stack coefficients for all relevant nutrients (constraints + objective)
+        # into one (n_nutrients, n_foods) block; coeff_arrays keeps named row views
+        all_nutrients = list(dict.fromkeys(list(nutrition_constraints.nutrients.keys()) + list(nutrients_to_optimize)))
+        coef_matrix = df[all_nutrients].to_numpy(dtype=np.float64).T
+        coeff_arrays = {nutrient: coef_matrix[j] for j, nutrient in enumerate(all_nutrients)}
+
         # Add constraints: lb <= sum_i coeff_ij * x_i <= ub, FORALL j in NUTRIENTS
         for nutrient, bounds in nutrition_constraints.nutrients.items():
             # support bounds being object-like with min_g/max_g or tuple/dict
             lb = getattr(bounds, 'min_g', None)
-            ub = getattr(bounds, 'max_g', None)
-            
+            ub_val = getattr(bounds, 'max_g', None)
+
             # fallback if bounds are dict-like or tuple-like can be added as needed
             if lb is None:
                 lb = 0.0
-            if ub is None or (isinstance(ub, float) and math.isinf(ub)):
-                ub_val = inf
-            else:
-                ub_val = float(ub)
-            c = solver.Constraint(float(lb), ub_val)
+            if ub_val is None:
+                ub_val = math.inf
+            # rare nutrients are mostly zeros; keep the constraint rows sparse
             coeffs = coeff_arrays[nutrient]
-            for i, var in enumerate(var_list):
-                c.SetCoefficient(var, float(coeffs[i]))
+            nz = np.nonzero(coeffs)[0]
+            expr = model_builder.LinearExpr.weighted_sum(var_arr[nz], coeffs[nz])
+            model.add_linear_constraint(expr, float(lb), float(ub_val))
 
         # Objective: linear combination of nutrients_to_optimize (default: equal weight)
         # objective_coefs[i] = sum_k weight_k * coeff_arrays[nutrient_k][i]
-        objective = solver.Objective()
-        # equal weights
         weights = {nut: 1.0 for nut in nutrients_to_optimize}
-        for i, var in enumerate(var_list):
-            coef = 0.0
-            for nut in nutrients_to_optimize:
-                coef += float(weights.get(nut, 1.0)) * float(coeff_arrays[nut][i])
-            objective.SetCoefficient(var, coef)
+        obj_coefs = np.zeros(n)
+        for nut in nutrients_to_optimize:
+            obj_coefs += weights[nut] * coeff_arrays[nut]
+        obj_nz = np.nonzero(obj_coefs)[0]
+        obj_expr = model_builder.LinearExpr.weighted_sum(var_arr[obj_nz], obj_coefs[obj_nz])
 
         if objective_type in ["min", "minimize", "minimization"]:
-            objective.SetMinimization()
+            model.minimize(obj_expr)
         elif objective_type in ["max", "maximize", "maximization"]:
-            objective.SetMaximization()
+            model.maximize(obj_expr)
         else:
             raise ValueError(f"Unrecognized objective_type '{settings.objective_type}'")
 
-        # Solve
-        status = solver.Solve()
-        if status != pywraplp.Solver.OPTIMAL:
-            if status == pywraplp.Solver.INFEASIBLE:
+        # Solve with HiGHS, a faster simplex/IPM implementation than GLOP for
+        # LPs of this shape; fall back to GLOP on builds without HiGHS
+        solver = model_builder.Solver('HIGHS')
+        if not solver.solver_is_supported():
+            solver = model_builder.Solver('GLOP')
+        if not solver.solver_is_supported():
+            raise RuntimeError("No LP solver available (tried HIGHS, GLOP)")
+        status = solver.solve(model)
+        if status != model_builder.SolveStatus.OPTIMAL:
+            if status == model_builder.SolveStatus.INFEASIBLE:
                 raise RuntimeError("Problem infeasible: cannot meet nutrition constraints with available foods.")
             else:
                 raise RuntimeError(f"Solver finished with status {status}")
 
-        # Extract solution amounts
-        amounts = [v.solution_value() for v in var_list]
-        data['amount_g'] = amounts
+        # Extract solution amounts straight into a preallocated buffer,
+        # skipping the intermediate Python list
+        amounts_np = np.fromiter((solver.value(v) for v in var_list), dtype=np.float64, count=n)
 
-        # Compute contribution columns for each constrained nutrient
-        for nutrient in all_nutrients:
-            data[f"{nutrient}_contrib"] = data['amount_g'] * data[nutrient]
+        # Compute contributions for each constrained nutrient on the coefficient
+        # views already extracted -- no need to copy or mutate the input frame
+        contribs = {f"{nutrient}_contrib": coeff_arrays[nutrient] * amounts_np for nutrient in all_nutrients}
 
         # energy contribution (kcal)
-        data['energy_kcal_contrib'] = data['amount_g'] * data['energy_kcal']
+        energy_arr = df['energy_kcal'].to_numpy()
+        energy_contrib = energy_arr * amounts_np
 
-        # filter tiny numeric noise -> selected
+        # filter tiny numeric noise -> selected; output only the columns callers use
         eps = 1e-9
-        chosen_foods = data[data['amount_g'] > eps].copy().reset_index(drop=True)
-
-        # Totals
+        mask = amounts_np > eps
+        chosen_foods = pd.DataFrame({
+            'food_code': codes[mask],
+            'main_food_description': df['main_food_description'].to_numpy()[mask],
+            'amount_g': amounts_np[mask],
+        })
+        for name, contrib in contribs.items():
+            chosen_foods[name] = contrib[mask]
+        if 'energy_kcal_contrib' not in chosen_foods.columns:
+            chosen_foods['energy_kcal_contrib'] = energy_contrib[mask]
+
+        # Totals: one matvec gives every nutrient total at once instead of a
+        # separate column reduction per nutrient
+        totals_vec = coef_matrix @ amounts_np
         totals: dict[str, float] = {}
-        totals['num_items_chosen'] = int((chosen_foods['amount_g'] > 0).sum())
-        totals['objective_value'] = float(objective.Value())
-        totals['total_energy_kcal'] = float((data['energy_kcal_contrib']).sum())
+        totals['num_items_chosen'] = int(mask.sum())
+        totals['objective_value'] = float(solver.objective_value)
+        totals['total_energy_kcal'] = float(energy_arr @ amounts_np)
         # totals for each nutrient in constraints & objective
-        for nutrient in all_nutrients:
-            totals[f"total_{nutrient}"] = float(data[f"{nutrient}_contrib"].sum())
+        for j, nutrient in enumerate(all_nutrients):
+            totals[f"total_{nutrient}"] = float(totals_vec[j])
 
         # attach some diagnostics to returned df (optional)
         chosen_foods.attrs['solver_status'] = 'OPTIMAL'